@@ -6,7 +6,13 @@ import io
 import re
 import time
 import base64
+import csv
+import hashlib
 import os
+import string
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
 import pandas as pd
 import streamlit as st
 from datetime import datetime
@@ -21,6 +27,12 @@ except Exception:
     except Exception:
         PyPDF2 = None
 
+# PDFium (C++) extracts text several times faster; PyPDF2/pypdf remains the fallback.
+try:
+    import pypdfium2 as pdfium
+except Exception:
+    pdfium = None
+
 # Optional deps (handled gracefully):
 try:
     import docx2txt
@@ -29,10 +41,10 @@ except Exception:
 
 try:
     import qrcode
-    from PIL import Image
+    from qrcode.image.pure import PyPNGImage
 except Exception:
     qrcode = None
-    Image = None
+    PyPNGImage = None
 
 st.set_page_config(page_title="AI Resume Score — LinkSkill Academy", page_icon="🧠", layout="wide")
 
@@ -42,10 +54,16 @@ st.set_page_config(page_title="AI Resume Score — LinkSkill Academy", page_icon
 BRAND_PRIMARY = "#0b235a"   # Navy
 BRAND_ACCENT  = "#ff7a00"   # Orange
 LEADS_CSV     = "leads.csv"
+LEAD_COLS     = [
+    "timestamp","name","email","phone","target_role","extra_keywords",
+    "score","breakdown","word_count"
+]
 
-ALLOWED_EXTS = (".pdf", ".docx", ".txt")
+ALLOWED_EXTS = ("pdf", "docx", "txt")
 MAX_FILE_MB  = 5
 MAX_FILE_BYTES = MAX_FILE_MB * 1024 * 1024
+MAX_TEXT_CHARS = 20_000  # longer resumes are already penalized on length; stop extracting here
+PDF_LOCKED_MSG = "This PDF is password-protected. Export an unlocked PDF or upload DOCX."
 
 ROLE_KEYWORDS = {
     "General / Fresher": [
@@ -77,21 +95,23 @@ ROLE_KEYWORDS = {
         "testing", "ci/cd", "design patterns", "oop", "algorithm", "data structures"
     ]
 }
+# Lists keep the display order for "missing examples"; the frozensets are for membership tests.
+ROLE_SETS = {role: frozenset(kws) for role, kws in ROLE_KEYWORDS.items()}
 
-ACTION_VERBS = [
+ACTION_VERBS = frozenset([
     "led","built","created","developed","designed","launched","optimized","reduced","increased","improved",
     "automated","migrated","enhanced","analysed","analyzed","implemented","managed","delivered","deployed",
     "streamlined","orchestrated","scaled","architected","spearheaded"
-]
+])
 
-CERT_WORDS = [
+CERT_WORDS = frozenset([
     "certified","certificate","coursera","udemy","pl-300","pmp","six sigma","itil","aws","azure","gcp",
     "google analytics","meta","hubspot"
-]
+])
 
-EDU_WORDS = [
+EDU_WORDS = frozenset([
     "b.e","btech","b.tech","bsc","b.sc","msc","m.sc","mca","bca","mba","bachelor","master","degree","college","university"
-]
+])
 
 SECTION_HINTS = {
     "Summary/Objectives": ["summary", "objective", "profile"],
@@ -102,115 +122,241 @@ SECTION_HINTS = {
     "Certifications": ["certifications", "certificates", "licenses"],
     "Achievements": ["awards", "achievements", "accomplishments"]
 }
+SECTION_POINTS = 20/len(SECTION_HINTS)
+SECTION_RES = {
+    sec: re.compile(r"\b(?:" + "|".join(re.escape(a) for a in aliases) + r")s?\b")  # "objectives", "experiences"
+    for sec, aliases in SECTION_HINTS.items()
+}
+
+EMAIL_RE  = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE  = re.compile(r"\b(\+?\d{1,3}[-\s]?)?\d{10}\b")
+NUM_RE    = re.compile(r"\b\d+[%k]?\b")  # matched against lowercased text, so no re.I needed
+TOKEN_RE  = re.compile(r"[a-z0-9+#]+(?:[./-][a-z0-9+#]+)*")
+TOKEN_SEP_RE = re.compile(r"[./-]")
+
+# ASCII characters that never count as "special"; translate() strips them in C.
+PLAIN_CHARS_TBL = dict.fromkeys(map(ord, string.ascii_letters + string.digits + string.whitespace + ".,;:-()/&+%"))
 
 def fmt_mb(num_bytes):
     return f"{num_bytes/1024/1024:.1f} MB"
 
-def precheck_file(file):
+def file_ext(name):
+    base, dot, ext = name.rpartition(".")
+    return ext.lower() if dot else ""
+
+def pdf_text_from_reader(reader):
+    chunks = []
+    total = 0
+    for page in getattr(reader, "pages", []):
+        try:
+            t = page.extract_text() or ""
+        except Exception:
+            continue
+        chunks.append(t)
+        total += len(t)
+        if total >= MAX_TEXT_CHARS:
+            break
+    return "".join(chunks)
+
+PDFIUM_LOCK = threading.Lock()
+
+def pdfium_text(data):
+    # None when pdfium is missing or can't open the file (e.g. encrypted); callers then fall back to PyPDF2.
+    if pdfium is None:
+        return None
+    # PDFium is not thread-safe and Streamlit runs each session in its own thread.
+    with PDFIUM_LOCK:
+        try:
+            pdf = pdfium.PdfDocument(data)
+        except Exception:
+            return None
+        try:
+            chunks = []
+            total = 0
+            for page in pdf:
+                textpage = page.get_textpage()
+                t = textpage.get_text_bounded().replace("\r\n", "\n")
+                textpage.close(); page.close()
+                chunks.append(t)
+                total += len(t)
+                if total >= MAX_TEXT_CHARS:
+                    break
+            # PDFium page text has no trailing newline; keep pages from running together.
+            return "\n".join(chunks)
+        except Exception:
+            return None
+        finally:
+            pdf.close()
+
+def precheck_file(file, data):
+    """Return (checks, first_error, prefetched_text); PDF text read here is reused for scoring."""
     name = file.name
     size = getattr(file, "size", None)
-    ext = os.path.splitext(name)[1].lower()
+    ext = file_ext(name)
     checks = {
         "type_supported": ext in ALLOWED_EXTS,
         "size_ok": (size is not None and size <= MAX_FILE_BYTES),
         "not_empty": (size or 0) > 0,
         "readable_text": False,
         "not_password_protected": True,
-        "pdf_reader_available": PyPDF2 is not None if ext == ".pdf" else True
+        "pdf_reader_available": (PyPDF2 is not None or pdfium is not None) if ext == "pdf" else True
     }
-    first_error = ""
+    prefetched = None
     if not checks["type_supported"]:
-        return checks, "Unsupported file type. Please upload PDF, DOCX or TXT."
+        return checks, "Unsupported file type. Please upload PDF, DOCX or TXT.", None
     if not checks["not_empty"]:
-        return checks, "This file is empty. Please upload a valid resume file."
+        return checks, "This file is empty. Please upload a valid resume file.", None
     if not checks["size_ok"]:
-        return checks, f"File too large ({fmt_mb(size)}). Max allowed is {MAX_FILE_MB} MB."
-    if ext == ".pdf" and not checks["pdf_reader_available"]:
-        return checks, "PDF reader is not available on server. Ask us at the desk or upload DOCX."
+        return checks, f"File too large ({fmt_mb(size)}). Max allowed is {MAX_FILE_MB} MB.", None
+    if ext == "pdf" and not checks["pdf_reader_available"]:
+        return checks, "PDF reader is not available on server. Ask us at the desk or upload DOCX.", None
     try:
-        data = file.read()
-        file.seek(0)
-        if ext == ".pdf" and PyPDF2 is not None:
-            try:
-                reader = PyPDF2.PdfReader(io.BytesIO(data))
-                if getattr(reader, "is_encrypted", False):
-                    try:
-                        reader.decrypt("")
-                    except Exception:
-                        checks["not_password_protected"] = False
-                        return checks, "This PDF is password-protected. Export an unlocked PDF or upload DOCX."
-                txt = ""
-                pages = getattr(reader, "pages", [])
-                for p in pages[:2]:
-                    try:
-                        txt += p.extract_text() or ""
-                    except Exception:
-                        continue
-                checks["readable_text"] = bool(txt.strip())
-                if not checks["readable_text"]:
-                    return checks, "This PDF looks like a scanned image. Upload a text-based PDF or DOCX."
-            except Exception:
-                return checks, "We couldn't open this PDF. Export a new text-based PDF or upload DOCX."
+        if ext == "pdf":
+            # Goes through the digest-keyed extraction cache, so re-submitting the same PDF skips parsing.
+            txt, hint = extract_text_from_file(file, data)
+            checks["not_password_protected"] = hint != PDF_LOCKED_MSG
+            checks["readable_text"] = bool(txt)
+            if hint:
+                return checks, hint, None
+            prefetched = txt
         else:
             checks["readable_text"] = True
     except Exception:
-        return checks, "We couldn't read this file. Re-upload or try a different format."
-    return checks, ""
-
-def extract_text_from_file(uploaded_file):
-    name = uploaded_file.name.lower()
-    data = uploaded_file.read()
-    uploaded_file.seek(0)
-    if name.endswith(".pdf"):
-        if PyPDF2 is None:
-            return "", "PDF reader not available on server."
-        text = ""
-        try:
-            reader = PyPDF2.PdfReader(io.BytesIO(data))
-            if getattr(reader, "is_encrypted", False):
-                try:
-                    reader.decrypt("")
-                except Exception:
-                    return "", "This PDF is password-protected. Export an unlocked PDF or upload DOCX."
-            for page in reader.pages:
-                try:
-                    text += page.extract_text() or ""
-                except Exception:
-                    continue
-        except Exception:
-            return "", "We couldn't open this PDF. Export a new text-based PDF or upload DOCX."
+        return checks, "We couldn't read this file. Re-upload or try a different format.", None
+    return checks, "", prefetched
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# Elements that stand for whitespace (docx2txt kept these as \t / \n too).
+W_RUN_BREAKS = {W_NS + "tab": "\t", W_NS + "br": "\n", W_NS + "cr": "\n"}
+
+def docx_xml_text(el):
+    # Text in document order, one line per paragraph. Paragraph properties are skipped (their
+    # w:tab is a tab-stop definition) and so is the VML fallback copy of each text box.
+    for child in el:
+        tag = child.tag
+        if tag == W_NS + "t":
+            yield child.text or ""
+        elif tag in W_RUN_BREAKS:
+            yield W_RUN_BREAKS[tag]
+        elif tag == W_NS + "pPr" or tag == MC_FALLBACK:
+            continue
+        else:
+            if tag == W_NS + "txbxContent":
+                yield "\n"  # keep a text box off the host paragraph's last word
+            yield from docx_xml_text(child)
+            if tag == W_NS + "p":
+                yield "\n"
+
+DOCX_HEADER_RE = re.compile(r"word/header\d*\.xml$")
+DOCX_FOOTER_RE = re.compile(r"word/footer\d*\.xml$")
+
+def docx_text_from_bytes(data):
+    # Read the parts straight from the upload instead of via a temp file. Headers, body, footers in
+    # docx2txt's order: templates often keep the name, email and phone in the page header.
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        names = z.namelist()
+        parts = [n for n in names if DOCX_HEADER_RE.match(n)]
+        parts.append("word/document.xml")
+        parts += [n for n in names if DOCX_FOOTER_RE.match(n)]
+        return "".join(t for part in parts for t in docx_xml_text(ET.fromstring(z.read(part))))
+
+def _extract_pdf(data):
+    text = pdfium_text(data)
+    if text is not None:
         if not text.strip():
             return "", "This PDF looks like a scanned image. Upload a text-based PDF or DOCX."
         return text, ""
-    if name.endswith(".docx"):
-        if docx2txt is None:
-            return "", "DOCX reader not available on server."
-        try:
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-                tmp.write(data); tmp.flush()
-                path = tmp.name
-            text = docx2txt.process(path) or ""
-            try: os.remove(path)
-            except Exception: pass
-            if not text.strip():
-                return "", "We couldn't read text from this DOCX. Save again or upload as PDF."
-            return text, ""
-        except Exception:
-            return "", "We couldn't open this DOCX. Save again or upload as PDF."
-    if name.endswith(".txt"):
-        try:
-            return data.decode("utf-8", errors="ignore"), ""
-        except Exception:
-            return "", "This text file could not be read. Please try a PDF or DOCX."
-    return "", "Unsupported file type. Please upload PDF, DOCX or TXT."
+    if PyPDF2 is None:
+        return "", "PDF reader not available on server."
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        if getattr(reader, "is_encrypted", False):
+            try:
+                reader.decrypt("")
+            except Exception:
+                return "", PDF_LOCKED_MSG
+        text = pdf_text_from_reader(reader)
+    except Exception:
+        return "", "We couldn't open this PDF. Export a new text-based PDF or upload DOCX."
+    if not text.strip():
+        return "", "This PDF looks like a scanned image. Upload a text-based PDF or DOCX."
+    return text, ""
 
-def contains_any(text, words):
-    tl = text.lower()
-    return [w for w in words if w in tl]
+def _extract_docx(data):
+    try:
+        text = docx_text_from_bytes(data)
+        if not text.strip():
+            return "", "We couldn't read text from this DOCX. Save again or upload as PDF."
+        return text, ""
+    except Exception:
+        pass
+    # Fall back to docx2txt for files the direct XML read can't handle.
+    if docx2txt is None:
+        return "", "We couldn't open this DOCX. Save again or upload as PDF."
+    try:
+        import tempfile
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
+            tmp.write(data); tmp.flush()
+            path = tmp.name
+        text = docx2txt.process(path) or ""
+        try: os.remove(path)
+        except Exception: pass
+        if not text.strip():
+            return "", "We couldn't read text from this DOCX. Save again or upload as PDF."
+        return text, ""
+    except Exception:
+        return "", "We couldn't open this DOCX. Save again or upload as PDF."
+
+def _extract_txt(data):
+    try:
+        return data.decode("utf-8", errors="ignore"), ""
+    except Exception:
+        return "", "This text file could not be read. Please try a PDF or DOCX."
+
+EXT_HANDLERS = {"pdf": _extract_pdf, "docx": _extract_docx, "txt": _extract_txt}
+
+def extract_text_from_file(uploaded_file, data):
+    digest = hashlib.sha1(data).hexdigest()
+    return _extract_cached(digest, file_ext(uploaded_file.name), data)
+
+# Keyed on the content digest (the leading underscore keeps Streamlit from re-hashing the bytes),
+# so re-submitting the same resume skips re-parsing it.
+@st.cache_data(show_spinner=False, max_entries=64)
+def _extract_cached(digest: str, ext: str, _data: bytes):
+    handler = EXT_HANDLERS.get(ext)
+    return handler(_data) if handler else ("", "Unsupported file type. Please upload PDF, DOCX or TXT.")
 
-def count_regex(text, pattern, flags=re.I):
-    return len(re.findall(pattern, text, flags))
+def keyword_vocab(tl, extra_words=()):
+    # Whole-word unigrams and bigrams of the lowercased text, so "java" no longer matches "javascript".
+    tokens = TOKEN_RE.findall(tl)
+    vocab = set(tokens)
+    vocab.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    # Joined tokens also count by their parts: "python/sql", "node.js", "python-based".
+    vocab.update(part for t in tokens if not t.isalnum() for part in TOKEN_SEP_RE.split(t))
+    vocab.update(t[:-1] for t in tokens if t.endswith("s"))  # "awards" still counts as "award"
+    # User-supplied extras the vocabulary can't hold ("r&d", 3+ word phrases) fall back to a substring check.
+    vocab.update(w for w in extra_words if not in_token_vocab(w) and w in tl)
+    return vocab
+
+def in_token_vocab(phrase):
+    # True when keyword_vocab can represent the phrase: one TOKEN_RE token or a pair of them.
+    parts = phrase.split(" ")
+    return len(parts) <= 2 and all(TOKEN_RE.fullmatch(p) for p in parts)
+
+def special_char_ratio(text):
+    rest = text.translate(PLAIN_CHARS_TBL)
+    # Any ASCII left over is punctuation/symbols, so only non-ASCII leftovers need classifying.
+    if rest.isascii():
+        specials = len(rest)
+    else:
+        specials = sum(not (ch.isalnum() or ch.isspace()) for ch in rest)
+    return specials / max(len(text),1)
+
+def find_keywords(vocab, words):
+    return [w for w in words if w in vocab]
 
 def score_resume(text, target_role="General / Fresher", extra_keywords=None):
     tl = text.lower()
@@ -218,41 +364,47 @@ def score_resume(text, target_role="General / Fresher", extra_keywords=None):
     suggestions = []
     structure_points = 0
     structure_hits = {}
-    for sec, aliases in SECTION_HINTS.items():
-        hit = any(a in tl for a in aliases)
+    for sec, pattern in SECTION_RES.items():
+        hit = bool(pattern.search(tl))
         structure_hits[sec] = hit
         if hit:
-            structure_points += 20/len(SECTION_HINTS)
+            structure_points += SECTION_POINTS
     structure_points = round(structure_points, 1)
     for sec, hit in structure_hits.items():
         if not hit:
             suggestions.append(f"Add a clear “{sec}” section.")
-    role_words = ROLE_KEYWORDS.get(target_role, ROLE_KEYWORDS["General / Fresher"]).copy()
-    if extra_keywords:
-        role_words += [k.strip().lower() for k in extra_keywords.split(",") if k.strip()]
-    found_role = contains_any(tl, role_words)
+    role_key = target_role if target_role in ROLE_KEYWORDS else "General / Fresher"
+    role_words = ROLE_KEYWORDS[role_key]
+    role_set = ROLE_SETS[role_key]
+    extras = [k.strip().lower() for k in extra_keywords.split(",") if k.strip()] if extra_keywords else []
+    if extras:
+        role_words = role_words + [k for k in dict.fromkeys(extras) if k not in role_set]
+        role_set = role_set.union(extras)
+    vocab = keyword_vocab(tl, extras)
+    found_role = role_set & vocab
     kw_points = min(len(found_role) * (30/12), 30)
     if len(found_role) < 8:
+        missing = [w for w in role_words if w not in found_role][:8]
         suggestions.append(f"Include more role keywords (target: {target_role}). Missing examples: " +
-                           ", ".join(sorted(set(role_words) - set(found_role))[:8]))
-    nums = count_regex(tl, r"\b\d+[%k]?\b")
-    action_uses = len(contains_any(tl, ACTION_VERBS))
+                           ", ".join(missing))
+    nums = len(NUM_RE.findall(tl))
+    action_uses = len(find_keywords(vocab, ACTION_VERBS))
     impact_points = min(10 + min(nums, 5)*2 + min(action_uses, 5)*1.5, 20)
     if nums < 3:
         suggestions.append("Quantify achievements (%, ₹, numbers) to show impact.")
     if action_uses < 3:
         suggestions.append("Start bullet points with strong action verbs (Led, Built, Improved...).")
-    edu_hits = len(contains_any(tl, EDU_WORDS))
-    cert_hits = len(contains_any(tl, CERT_WORDS))
+    edu_hits = len(find_keywords(vocab, EDU_WORDS))
+    cert_hits = len(find_keywords(vocab, CERT_WORDS))
     edu_points = min(edu_hits*2 + min(cert_hits, 3)*2, 10)
     if edu_hits == 0:
         suggestions.append("Add Education details (degree, college, year).")
     if cert_hits == 0:
         suggestions.append("List relevant certifications (PMP, PL-300, Google, Meta, etc.).")
-    email_ok = bool(re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", tl))
-    phone_ok = bool(re.search(r"\b(\+?\d{1,3}[-\s]?)?\d{10}\b", tl))
-    bullets = count_regex(text, r"(\n[-•·])|•")
-    special_ratio = sum(not (ch.isalnum() or ch.isspace() or ch in ".,;:-()/&+%") for ch in text) / max(len(text),1)
+    email_ok = bool(EMAIL_RE.search(tl))
+    phone_ok = bool(PHONE_RE.search(tl))
+    bullets = text.count("•") + text.count("\n-") + text.count("\n·")
+    special_ratio = special_char_ratio(text)
     ats_points = 0
     if email_ok: ats_points += 3
     if phone_ok: ats_points += 3
@@ -277,26 +429,34 @@ def score_resume(text, target_role="General / Fresher", extra_keywords=None):
 
 def init_leads():
     if not os.path.exists(LEADS_CSV):
-        pd.DataFrame(columns=[
-            "timestamp","name","email","phone","target_role","extra_keywords",
-            "score","breakdown","word_count"
-        ]).to_csv(LEADS_CSV, index=False)
+        with open(LEADS_CSV, "w", newline="", encoding="utf-8") as f:
+            csv.DictWriter(f, fieldnames=LEAD_COLS).writeheader()
 
 def save_lead(row: dict):
-    init_leads()
-    df = pd.read_csv(LEADS_CSV)
-    df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-    df.to_csv(LEADS_CSV, index=False)
+    new = not os.path.exists(LEADS_CSV)
+    with open(LEADS_CSV, "a", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=LEAD_COLS, restval="")
+        if new: w.writeheader()
+        w.writerow(row)
+
+@st.cache_data(show_spinner=False, max_entries=1)  # each save changes the mtime key; keep only the latest
+def load_leads(mtime):
+    # mtime is only the cache key: the CSV is re-read after each save_lead.
+    return pd.read_csv(LEADS_CSV)
 
 def make_qr_png_bytes(url: str):
-    if not qrcode or not Image:
-        st.warning("Install 'qrcode' and 'Pillow' to generate QR codes (see requirements.txt).")
+    if not qrcode or not PyPNGImage:
+        st.warning("Install 'qrcode' and 'pypng' to generate QR codes (see requirements.txt).")
         return None
-    qr = qrcode.QRCode(version=1, box_size=10, border=4)
+    return _qr_png_cached(url)
+
+# Same URL → same PNG; re-clicking "Generate QR Code" is a cache hit.
+@st.cache_data(show_spinner=False)
+def _qr_png_cached(url: str):
+    qr = qrcode.QRCode(version=1, box_size=10, border=4, image_factory=PyPNGImage)
     qr.add_data(url); qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    buf = io.BytesIO(); img.save(buf, format="PNG"); buf.seek(0)
-    return buf.read()
+    buf = io.BytesIO(); qr.make_image().save(buf)
+    return buf.getvalue()
 
 # -----------------------------
 # UI
@@ -323,7 +483,7 @@ with st.sidebar:
     st.markdown("---")
     st.subheader("Leads Export")
     init_leads()
-    df_leads = pd.read_csv(LEADS_CSV)
+    df_leads = load_leads(os.path.getmtime(LEADS_CSV))
     st.write(f"Total leads captured: **{len(df_leads)}**")
     st.dataframe(df_leads.tail(10))
     csv_bytes = df_leads.to_csv(index=False).encode("utf-8")
@@ -341,7 +501,7 @@ with st.form("resume_form", clear_on_submit=False):
     with col2:
         target_role = st.selectbox("Target Role", list(ROLE_KEYWORDS.keys()), index=0)
         extra_kw = st.text_input("Extra Keywords (comma-separated, optional)", placeholder="power bi, pl-300, snowflake")
-    uploaded = st.file_uploader("Upload Resume", type=[ext.strip(".") for ext in ALLOWED_EXTS], accept_multiple_files=False)
+    uploaded = st.file_uploader("Upload Resume", type=list(ALLOWED_EXTS), accept_multiple_files=False)
     agree = st.checkbox("I agree to be contacted by LinkSkill Academy about training & placement.")
     submitted = st.form_submit_button("🔍 Score My Resume", use_container_width=True)
 
@@ -349,7 +509,10 @@ if submitted:
     if not (name and email and phone and uploaded and agree):
         st.error("Please fill all fields, upload a resume, and accept the consent checkbox.")
     else:
-        checks, first_error = precheck_file(uploaded)
+        # Read the upload once; precheck and extraction share these bytes.
+        data = uploaded.read()
+        uploaded.seek(0)
+        checks, first_error, prefetched = precheck_file(uploaded, data)
         st.markdown("#### Pre-checks")
         cols = st.columns(6)
         cols[0].write(("✅" if checks["type_supported"] else "❌") + " Type supported")
@@ -364,7 +527,10 @@ if submitted:
             st.error(first_error)
         else:
             with st.spinner("Analyzing your resume..."):
-                raw_text, hint = extract_text_from_file(uploaded)
+                if prefetched:
+                    raw_text, hint = prefetched, ""
+                else:
+                    raw_text, hint = extract_text_from_file(uploaded, data)
                 if hint:
                     st.error(hint)
                 elif not raw_text.strip():
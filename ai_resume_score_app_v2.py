@@ -2,29 +2,42 @@
 # ai_resume_score_app_v2.py
 # LinkSkill Academy — AI Resume Score (Research-backed) — Streamlit
 
-import io, re, os, base64
+import io, re, os, base64, string, csv
+from collections import deque
 from datetime import datetime
-import pandas as pd
 import streamlit as st
 
 # Optional libs
+# PDF: prefer 'pypdf' (maintained, faster extraction), fall back to legacy 'PyPDF2'
 try:
-    import PyPDF2
+    import pypdf as PyPDF2
 except Exception:
-    PyPDF2 = None
+    try:
+        import PyPDF2
+    except Exception:
+        PyPDF2 = None
+
+# DOCX: prefer 'python-docx' (reads straight from memory), fall back to 'docx2txt'
+try:
+    from docx import Document as DocxDocument
+except Exception:
+    DocxDocument = None
 
 try:
     import docx2txt
 except Exception:
     docx2txt = None
 
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None
+
 # Similarity
 try:
     from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
 except Exception:
     TfidfVectorizer = None
-    cosine_similarity = None
 
 st.set_page_config(page_title="AI Resume Score — Research-backed", page_icon="🧠", layout="wide")
 
@@ -32,6 +45,15 @@ st.set_page_config(page_title="AI Resume Score — Research-backed", page_icon="
 BRAND_PRIMARY = "#0b235a"
 BRAND_ACCENT  = "#ff7a00"
 LEADS_CSV     = "leads.csv"
+LEAD_COLS     = ["timestamp","name","email","phone","target_role","score","breakdown","word_count"]
+
+# Header HTML is rendered once at import, not rebuilt on every rerun
+_BANNER_HTML = f"""
+<div style='padding:10px 16px;border-radius:12px;background:{BRAND_PRIMARY};color:white'>
+  <h2 style='margin:0'>🧠 AI Resume Score — Research‑backed</h2>
+  <p style='margin:6px 0 0 0'>Paste a Job Description for best accuracy. We score JD match, keywords, sections, quantified impact, ATS basics, and credentials.</p>
+</div>
+"""
 
 # Standard sections derived from widely-cited resume guidance
 STANDARD_SECTIONS = {
@@ -52,63 +74,149 @@ ROLE_KEYWORDS = {
     "UI/UX Design": ["figma","wireframe","prototype","user research","usability","interaction design","ui kit","persona","journey map","design system","accessibility","heuristics","visual design","hifi","lofi"],
     "General / Fresher": ["project","internship","team","lead","communication","problem solving","python","excel","sql","presentation","achievement","award","certification"]
 }
-
-ACTION_VERBS = [
+_ROLE_SETS  = {r: frozenset(kws) for r, kws in ROLE_KEYWORDS.items()}
+_ROLE_SIZES = {r: len(s) for r, s in _ROLE_SETS.items()}
+
+# Structure scoring: (section, single-word aliases matched on tokens, multi-word aliases matched as substrings)
+_STRUCT_SECTIONS = (
+    ("Summary/Objectives", frozenset(("summary","objective","profile")), ()),
+    ("Experience", frozenset(("experience","employment")), ("work experience","professional experience")),
+    ("Education", frozenset(("education","academics","university","college")), ()),
+    ("Skills", frozenset(("skills",)), ("technical skills",)),
+    ("Certifications", frozenset(("certifications","licenses","certificates")), ()),
+)
+
+ACTION_VERBS = frozenset([
     "led","built","created","developed","designed","launched","optimized","reduced","increased","improved",
     "automated","migrated","enhanced","analyzed","implemented","managed","delivered","deployed",
     "streamlined","orchestrated","scaled","architected","spearheaded","boosted","transformed"
-]
-
-CERT_WORDS = ["certified","certificate","pl-300","pmp","six sigma","itil","aws","azure","gcp","google analytics","meta","hubspot","scrum"]
-EDU_WORDS  = ["b.e","btech","b.tech","bsc","b.sc","msc","m.sc","mca","bca","mba","bachelor","master","degree","college","university"]
+])
+
+CERT_WORDS = frozenset(["certified","certificate","pl-300","pmp","six sigma","itil","aws","azure","gcp","google analytics","meta","hubspot","scrum"])
+EDU_WORDS  = frozenset(["b.e","btech","b.tech","bsc","b.sc","msc","m.sc","mca","bca","mba","bachelor","master","degree","college","university"])
+# Only the cert list has multi-word entries; split it so single words can be counted by set intersection
+_CERT_TOKENS  = frozenset(w for w in CERT_WORDS if " " not in w)
+_CERT_PHRASES = CERT_WORDS - _CERT_TOKENS
+
+# Compiled once at import; scoring runs on every upload
+_NUM_RE    = re.compile(r"\b\d+[%k]?\b")  # matched against lowercased text, so no re.I needed
+_EMAIL_RE  = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE_RE  = re.compile(r"\b(\+?\d{1,3}[-\s]?)?\d{10}\b")
+_WORD_RE   = re.compile(r"[a-z0-9+#]+(?:[./-][a-z0-9+#]+)*")
+_SEP_RE    = re.compile(r"[./-]")
+
+# ASCII chars that never count as specials; str.translate deletes them in C
+_DEL_TABLE = dict.fromkeys(map(ord, string.ascii_letters + string.digits + string.whitespace + ".,;:-()/&+%"))
+
+def _build_phrase_automaton():
+    # Multi-word keywords can't use the token set; one Aho–Corasick automaton finds them all in a single sweep.
+    if ahocorasick is None: return None
+    phrases = {w for kws in ROLE_KEYWORDS.values() for w in kws if " " in w}
+    phrases |= {w for w in ACTION_VERBS | CERT_WORDS | EDU_WORDS if " " in w}
+    ac = ahocorasick.Automaton()
+    for w in phrases: ac.add_word(w, w)
+    ac.make_automaton()
+    return ac
+
+_PHRASE_AC = _build_phrase_automaton()
 
 # ---------------- HELPERS ----------------
 def extract_text(file) -> str:
-    name = file.name.lower()
-    data = file.read()
+    return _extract_cached(file.name.lower(), file.read())
+
+def docx_text(doc):
+    # Headers, body, tables, footers: templates often keep the name/email/phone in the page header
+    headers, footers = [], []
+    for sec in doc.sections:
+        for hf in (sec.first_page_header, sec.header, sec.even_page_header):
+            if not hf.is_linked_to_previous: headers += [p.text for p in hf.paragraphs]
+        for hf in (sec.first_page_footer, sec.footer, sec.even_page_footer):
+            if not hf.is_linked_to_previous: footers += [p.text for p in hf.paragraphs]
+    cells, seen = [], set()
+    for t in doc.tables:
+        for r in t.rows:
+            for c in r.cells:
+                # A merged cell is returned once per grid column/row it spans
+                if c._tc in seen: continue
+                seen.add(c._tc); cells.append(c.text)
+    return "\n".join(headers + [p.text for p in doc.paragraphs] + cells + footers)
+
+# Memoized on the file bytes: Streamlit reruns re-send the same upload, so skip re-parsing it
+@st.cache_data(show_spinner=False, max_entries=64)
+def _extract_cached(name: str, data: bytes) -> str:
     # pdf
     if name.endswith(".pdf") and PyPDF2 is not None:
-        text = ""
+        parts = []
         try:
             reader = PyPDF2.PdfReader(io.BytesIO(data))
             for p in reader.pages:
-                try: text += p.extract_text() or ""
+                try: parts.append(p.extract_text() or "")
                 except Exception: continue
         except Exception: pass
+        text = "".join(parts)
         if text.strip(): return text
     # docx
-    if name.endswith(".docx") and docx2txt is not None:
-        try:
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-                tmp.write(data); tmp.flush(); path = tmp.name
-            text = docx2txt.process(path) or ""
-            try: os.remove(path)
+    if name.endswith(".docx"):
+        text = ""
+        if DocxDocument is not None:
+            try:
+                text = docx_text(DocxDocument(io.BytesIO(data)))
             except Exception: pass
-            if text.strip(): return text
-        except Exception: pass
-    # txt fallback
-    try: return data.decode("utf-8", errors="ignore")
-    except Exception: return ""
-
-def has_any(text, words):
-    tl = text.lower()
-    return [w for w in words if w in tl]
-
-def count_regex(text, pattern, flags=re.I):
-    return len(re.findall(pattern, text, flags))
-
+        # Both parsers take a file-like object, so the upload never touches disk
+        if not text.strip() and docx2txt is not None:
+            try: text = docx2txt.process(io.BytesIO(data)) or ""
+            except Exception: pass
+        if text.strip(): return text
+    # txt only: decoding a binary PDF/DOCX that yielded no text just produces junk to score
+    if name.endswith(".txt"):
+        return data.decode("utf-8", errors="ignore")
+    return ""
+
+def token_lookup(tokens):
+    token_set = set(tokens)
+    token_set.update([t[:-1] for t in token_set if t.endswith("s")])  # "awards" -> "award"
+    token_set.update([p for t in token_set if not t.isalnum() for p in _SEP_RE.split(t)])  # "python/sql", "ms-excel", "node.js"
+    return token_set
+
+def phrase_hits(tl):
+    if _PHRASE_AC is None: return None
+    return {w for _, w in _PHRASE_AC.iter(tl)}
+
+def has_any(tl, words, token_set, phrases=None):
+    # Whole-word set lookup for single words; multi-word phrases come from the automaton sweep,
+    # or a substring scan when pyahocorasick isn't installed.
+    return [w for w in words if (w in token_set if " " not in w else (w in phrases if phrases is not None else w in tl))]
+
+def special_ratio(text):
+    rest = text.translate(_DEL_TABLE)
+    # ASCII leftovers are all symbols; only non-ASCII leftovers need a per-char check
+    n = len(rest) if rest.isascii() else sum(not (ch.isalnum() or ch.isspace()) for ch in rest)
+    return n / max(len(text),1)
+
+# Fitted per resume+JD pair so the vocabulary covers every term in either text;
+# memoized on the texts so reruns with the same inputs skip the fit.
+@st.cache_data(show_spinner=False, max_entries=64)
 def tfidf_similarity(a, b):
     if not TfidfVectorizer or not a.strip() or not b.strip(): return 0.0
-    vec = TfidfVectorizer(stop_words="english")
-    m = vec.fit_transform([a, b])
-    sim = cosine_similarity(m[0:1], m[1:2])[0][0]
+    m = TfidfVectorizer(stop_words="english").fit_transform([a, b])
+    # Rows are already L2-normalized, so cosine similarity is just their dot product
+    sim = m[0].multiply(m[1]).sum()
     return float(sim)
 
 # ---------------- SCORING ----------------
 def score_resume(text, role="General / Fresher", jd_text=""):
     tl = text.lower()
-    word_count = len(tl.split())
+    # Tokenize once; the count and the keyword lookups share the same tokens.
+    # A regex rather than tl.split(): split() leaves punctuation attached ("sql," / "(python)") and those would miss the set.
+    tokens = _WORD_RE.findall(tl)
+    word_count = len(tokens)
+    # Too little text to score (scanned PDF / no text layer): skip the keyword, regex and TF-IDF work
+    if word_count < 30:
+        breakdown = {k: 0.0 for k in ("JD Similarity","Keywords","Structure","Impact","ATS","Education/Certs")}
+        breakdown["Word Count"] = word_count
+        return 0.0, breakdown, ["Resume appears empty — please upload a text-based PDF/DOCX."]
+    token_set = token_lookup(tokens)
+    phrases = phrase_hits(tl)
     suggestions = []
 
     # A) JD Similarity (0–35)
@@ -122,39 +230,34 @@ def score_resume(text, role="General / Fresher", jd_text=""):
         suggestions.append("Paste a Job Description to improve match scoring.")
 
     # B) Role Keywords Coverage (0–25)
-    role_words = ROLE_KEYWORDS.get(role, ROLE_KEYWORDS["General / Fresher"])
-    found = has_any(tl, role_words)
-    coverage = len(found) / max(len(set(role_words)), 1)
+    role_key = role if role in _ROLE_SETS else "General / Fresher"
+    role_set = _ROLE_SETS[role_key]
+    found = has_any(tl, role_set, token_set, phrases)
+    coverage = len(found) / max(_ROLE_SIZES[role_key], 1)
     kw_points = min(25.0, round(coverage * 25.0 + min(len(found), 12), 1))  # blend breadth + count
     if coverage < 0.5:
-        missing = ", ".join(sorted(set(role_words) - set(found))[:10])
+        missing = ", ".join(sorted(role_set.difference(found))[:10])
         suggestions.append(f"Add relevant {role} keywords (e.g., {missing}).")
 
     # C) Structure & Sections (0–15)
     struct = 0.0
-    for sec, aliases in {
-        "Summary/Objectives": ["summary","objective","profile"],
-        "Experience": ["experience","work experience","professional experience","employment"],
-        "Education": ["education","academics","university","college"],
-        "Skills": ["skills","technical skills"],
-        "Certifications": ["certifications","licenses","certificates"]
-    }.items():
-        if any(a in tl for a in aliases): struct += 15.0/5.0
+    for sec, aliases, multi in _STRUCT_SECTIONS:
+        if not aliases.isdisjoint(token_set) or any(p in tl for p in multi): struct += 15.0/len(_STRUCT_SECTIONS)
         else: suggestions.append(f"Add a clear “{sec}” section.")
     struct = round(struct, 1)
 
     # D) Impact Signals (Action Verbs + Numbers) (0–15)
-    nums = count_regex(tl, r"\b\d+[%k]?\b")
-    actions = len(has_any(tl, ACTION_VERBS))
+    nums = len(_NUM_RE.findall(tl))
+    actions = len(ACTION_VERBS & token_set)
     impact = min(15.0, round(min(nums, 6)*1.8 + min(actions, 6)*0.9, 1))
     if nums < 3: suggestions.append("Quantify achievements with numbers (%, ₹, users, time saved).")
     if actions < 3: suggestions.append("Start bullets with strong action verbs (Led, Built, Improved...).")
 
     # E) ATS Basics & Formatting (0–10)
-    email_ok = bool(re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", tl))
-    phone_ok = bool(re.search(r"\b(\+?\d{1,3}[-\s]?)?\d{10}\b", tl))
-    bullets  = count_regex(text, r"(\n[-•·])|•")
-    specials = sum(not (ch.isalnum() or ch.isspace() or ch in ".,;:-()/&+%") for ch in text) / max(len(text),1)
+    email_ok = bool(_EMAIL_RE.search(tl))
+    phone_ok = bool(_PHONE_RE.search(tl))
+    bullets  = text.count("•") + text.count("\n-") + text.count("\n·")
+    specials = special_ratio(text)
     ats = 0.0
     if email_ok: ats += 3
     if phone_ok: ats += 3
@@ -165,8 +268,8 @@ def score_resume(text, role="General / Fresher", jd_text=""):
     if specials >= 0.05: suggestions.append("Avoid heavy graphics/tables; use simple text formatting.")
 
     # F) Education & Certifications (0–5)
-    edu_hits  = len(has_any(tl, EDU_WORDS))
-    cert_hits = len(has_any(tl, CERT_WORDS))
+    edu_hits  = len(EDU_WORDS & token_set)
+    cert_hits = len(_CERT_TOKENS & token_set) + (len(_CERT_PHRASES & phrases) if phrases is not None else sum(p in tl for p in _CERT_PHRASES))
     edu = min(5.0, round( (1 if edu_hits>0 else 0)*3 + min(cert_hits,2)*1.0 ,1))
     if edu_hits == 0: suggestions.append("Include Education (degree, college, year).")
     if cert_hits == 0: suggestions.append("Add relevant certifications (PMP, PL-300, Google/Meta, etc.).")
@@ -184,28 +287,43 @@ def score_resume(text, role="General / Fresher", jd_text=""):
         "Education/Certs": edu,
         "Word Count": word_count
     }
-    out = []
-    for s in suggestions:
-        if s not in out: out.append(s)
-    return total, breakdown, out[:10]
+    # Ordered dedupe: dicts keep insertion order
+    return total, breakdown, list(dict.fromkeys(suggestions))[:10]
 
 def init_leads():
     if not os.path.exists(LEADS_CSV):
-        pd.DataFrame(columns=["timestamp","name","email","phone","target_role","score","breakdown","word_count"]).to_csv(LEADS_CSV, index=False)
+        with open(LEADS_CSV, "w", newline="", encoding="utf-8") as f:
+            csv.DictWriter(f, fieldnames=LEAD_COLS).writeheader()
+
+# Sidebar reads are cached across reruns; save_lead clears them when a lead is added
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_leads():
+    # (total rows, last 10 rows) in one streaming pass; no DataFrame needed for a 10-row preview
+    total = 0
+    tail = deque(maxlen=10)
+    with open(LEADS_CSV, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            total += 1
+            tail.append(row)
+    return total, list(tail)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _leads_csv_bytes():
+    with open(LEADS_CSV, "rb") as f:
+        return f.read()
 
 def save_lead(row: dict):
-    init_leads()
-    df = pd.read_csv(LEADS_CSV)
-    df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-    df.to_csv(LEADS_CSV, index=False)
+    # Append one row; no read-modify-write of the whole file per lead
+    new = not os.path.exists(LEADS_CSV)
+    with open(LEADS_CSV, "a", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=LEAD_COLS)
+        if new: w.writeheader()
+        w.writerow({k: row.get(k, "") for k in LEAD_COLS})
+    _load_leads.clear()
+    _leads_csv_bytes.clear()
 
 # ---------------- UI ----------------
-st.markdown(f"""
-<div style='padding:10px 16px;border-radius:12px;background:{BRAND_PRIMARY};color:white'>
-  <h2 style='margin:0'>🧠 AI Resume Score — Research‑backed</h2>
-  <p style='margin:6px 0 0 0'>Paste a Job Description for best accuracy. We score JD match, keywords, sections, quantified impact, ATS basics, and credentials.</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(_BANNER_HTML, unsafe_allow_html=True)
 
 with st.form("form"):
     col1, col2 = st.columns([1,1])
@@ -256,7 +374,7 @@ if submitted:
 with st.sidebar:
     st.markdown("### Leads Export")
     init_leads()
-    df = pd.read_csv(LEADS_CSV)
-    st.write(f"Total leads captured: **{len(df)}**")
-    st.dataframe(df.tail(10))
-    st.download_button("Download all leads (CSV)", df.to_csv(index=False).encode("utf-8"), file_name="leads.csv")
+    total_leads, recent_leads = _load_leads()
+    st.write(f"Total leads captured: **{total_leads}**")
+    st.dataframe(recent_leads)
+    st.download_button("Download all leads (CSV)", _leads_csv_bytes(), file_name="leads.csv")